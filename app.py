@@ -4,15 +4,26 @@ Aplicativo Streamlit para visualização de pontos geoespaciais a partir de arqu
 
 from __future__ import annotations
 
+import hashlib
 import io
+import os
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 from typing import Optional
 
+import numpy as np
 import pandas as pd
 import streamlit as st
+import streamlit.components.v1 as components
+from numba import njit
+from openpyxl import load_workbook
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 try:
-    from folium import Map, Marker
-    from folium.plugins import MarkerCluster
+    from folium import Map
+    from folium.plugins import FastMarkerCluster
 except ModuleNotFoundError as exc:
     st.error(
         "A biblioteca Folium não está instalada. Verifique se o arquivo "
@@ -20,62 +31,374 @@ except ModuleNotFoundError as exc:
     )
     st.stop()
 
-from streamlit_folium import st_folium
 
+# Colunas usadas para posicionar os pontos no mapa.
+COLUNAS_COORDENADAS = frozenset({"latitude", "longitude"})
 
-# Configuração inicial da página para um layout amplo.
-st.set_page_config(page_title="Instapoints", layout="wide")
+# Diretório onde os arquivos já interpretados são guardados em Parquet.
+DIRETORIO_CACHE = Path(__file__).resolve().parent / ".cache"
 
+# Versão do formato gravado no cache em disco. Deve ser incrementada sempre
+# que a saída dos leitores mudar, para que arquivos antigos sejam ignorados.
+VERSAO_CACHE = 2
 
-def carregar_dados(arquivo_subido: io.BytesIO) -> Optional[pd.DataFrame]:
-    """Lê o arquivo CSV ou XLSX enviado pelo usuário.
+# Tamanho máximo ocupado pelo cache em disco; os arquivos usados há mais tempo
+# são removidos quando o limite é ultrapassado.
+TAMANHO_MAXIMO_CACHE = 500 * 1024 * 1024
 
-    A função tenta identificar automaticamente o formato com base na extensão
-    informada pelo widget de upload. Caso a leitura falhe, uma mensagem de
-    erro amigável é apresentada e ``None`` é retornado.
+# Quantidade de linhas lidas por vez ao processar CSVs em blocos.
+TAMANHO_BLOCO_CSV = 200_000
+
+# Acima desta quantidade de pontos, o mapa mantém apenas um ponto por célula
+# de 0,1° de latitude/longitude. O limite pode ser ajustado na interface.
+LIMITE_PONTOS_PADRAO = 50_000
+LIMITE_PONTOS_MAXIMO = 1_000_000
+
+# Acima desta quantidade de linhas, o mapa é desenhado com ``st.map`` (WebGL)
+# em vez de marcadores Folium.
+LIMITE_PONTOS_FOLIUM = 5_000
+
+
+def _e_coluna_de_coordenada(nome: object) -> bool:
+    """Indica se o cabeçalho corresponde a latitude ou longitude."""
+
+    return str(nome).strip().lower() in COLUNAS_COORDENADAS
+
+
+def _ler_csv(buffer: io.BytesIO) -> pd.DataFrame:
+    """Lê um CSV com o motor PyArrow, recorrendo ao motor padrão se falhar.
+
+    Apenas as colunas de coordenadas são interpretadas: o cabeçalho é lido
+    primeiro para descobrir seus nomes, e as demais colunas são ignoradas pelo
+    leitor. O PyArrow interpreta o arquivo em paralelo e entrega colunas já no
+    formato Arrow, o que acelera bastante arquivos grandes. Como ele é mais
+    restrito quanto a formatos irregulares, o motor C do pandas continua como
+    reserva, lendo o arquivo em blocos para limitar o uso de memória.
     """
 
-    if arquivo_subido is None:
-        return None
+    buffer.seek(0)
+    cabecalho = pd.read_csv(buffer, nrows=0)
+    # Mantém só a primeira coluna de cada coordenada, como em ``_ler_xlsx``:
+    # cabeçalhos como ``Latitude`` e ``latitude`` ficariam com o mesmo nome
+    # após a normalização em ``carregar_dados``.
+    selecionadas = {}
+    for nome in cabecalho.columns:
+        if _e_coluna_de_coordenada(nome):
+            selecionadas.setdefault(str(nome).strip().lower(), nome)
+    colunas = list(selecionadas.values())
+    if not colunas:
+        # Sem coordenadas não há o que ler; o cabeçalho basta para que
+        # ``validar_colunas`` informe as colunas encontradas.
+        return cabecalho
+
+    # Coordenadas em ``float32`` têm precisão de sobra para exibição no mapa e
+    # ocupam metade da memória. Se alguma célula não for numérica, a leitura
+    # tipada falha e o motor de reserva mantém os valores para conversão
+    # posterior em ``construir_mapa``.
+    tipos = {nome: "float32" for nome in colunas}
+    try:
+        buffer.seek(0)
+        return pd.read_csv(
+            buffer,
+            usecols=colunas,
+            dtype=tipos,
+            engine="pyarrow",
+            dtype_backend="pyarrow",
+        )
+    except ImportError:
+        # Um PyArrow ausente ou incompatível é um problema de instalação, não
+        # de formato do arquivo; não deve desativar silenciosamente o leitor.
+        raise
+    except Exception:
+        buffer.seek(0)
+
+    blocos = pd.read_csv(
+        buffer,
+        usecols=colunas,
+        chunksize=TAMANHO_BLOCO_CSV,
+        engine="c",
+    )
+    return pd.concat(blocos, ignore_index=True)
 
+
+def _coluna_numerica(valores: list) -> np.ndarray:
+    """Converte os valores de uma coluna em ``float32`` sempre que possível.
+
+    Células vazias viram ``NaN``. Se houver textos não numéricos, os valores
+    são mantidos como objetos para a conversão tolerante de ``construir_mapa``.
+    """
+
+    try:
+        return np.asarray(valores, dtype=np.float32)
+    except (TypeError, ValueError):
+        return np.asarray(valores, dtype=object)
+
+
+def _ler_xlsx(buffer: io.BytesIO) -> pd.DataFrame:
+    """Lê uma planilha XLSX carregando somente as colunas de coordenadas.
+
+    A planilha é percorrida em modo somente leitura do openpyxl, que processa
+    as linhas sob demanda sem montar estilos e a estrutura completa da pasta
+    de trabalho, o que é bem mais rápido e econômico em arquivos grandes.
+    """
+
+    buffer.seek(0)
+    pasta = load_workbook(buffer, read_only=True, data_only=True)
     try:
-        nome_arquivo = getattr(arquivo_subido, "name", "")
-        extensao = nome_arquivo.split(".")[-1].lower() if "." in nome_arquivo else ""
+        linhas = pasta.active.iter_rows(values_only=True)
+        cabecalho = ["" if nome is None else str(nome) for nome in next(linhas, ())]
+
+        indices = {}
+        for posicao, nome in enumerate(cabecalho):
+            if _e_coluna_de_coordenada(nome):
+                indices.setdefault(nome.strip().lower(), posicao)
+        if len(indices) < len(COLUNAS_COORDENADAS):
+            # O cabeçalho basta para que ``validar_colunas`` informe as
+            # colunas encontradas.
+            return pd.DataFrame(columns=cabecalho)
+
+        posicao_lat = indices["latitude"]
+        posicao_lon = indices["longitude"]
+        latitudes = []
+        longitudes = []
+        for linha in linhas:
+            latitudes.append(linha[posicao_lat] if posicao_lat < len(linha) else None)
+            longitudes.append(linha[posicao_lon] if posicao_lon < len(linha) else None)
+    finally:
+        pasta.close()
+
+    return pd.DataFrame(
+        {
+            cabecalho[posicao_lat]: _coluna_numerica(latitudes),
+            cabecalho[posicao_lon]: _coluna_numerica(longitudes),
+        }
+    )
+
 
-        conteudo = arquivo_subido.getvalue()
-        buffer = io.BytesIO(conteudo)
+def _interpretar_arquivo(buffer: io.BytesIO, extensao: str) -> pd.DataFrame:
+    """Escolhe o leitor adequado à extensão e converte o arquivo."""
 
-        if extensao == "xlsx":
-            return pd.read_excel(buffer, engine="openpyxl")
+    if extensao == "xlsx":
+        return _ler_xlsx(buffer)
 
-        if extensao == "csv":
-            buffer.seek(0)
-            return pd.read_csv(buffer)
+    if extensao == "csv":
+        return _ler_csv(buffer)
 
-        # Se a extensão for desconhecida, tentamos primeiro como CSV e, em caso de
-        # falha, como XLSX para cobrir cenários em que o usuário enviou o arquivo
-        # correto, porém sem extensão ou com um tipo MIME inesperado.
+    # Se a extensão for desconhecida, tentamos primeiro como CSV e, em caso de
+    # falha, como XLSX para cobrir cenários em que o usuário enviou o arquivo
+    # correto, porém sem extensão ou com um tipo MIME inesperado.
+    try:
+        return _ler_csv(buffer)
+    except ImportError:
+        raise
+    except Exception:
+        return _ler_xlsx(buffer)
+
+
+def _limpar_cache() -> None:
+    """Remove os arquivos usados há mais tempo até respeitar o limite do cache."""
+
+    arquivos = []
+    for caminho in DIRETORIO_CACHE.glob("*.parquet"):
         try:
-            buffer.seek(0)
-            return pd.read_csv(buffer)
-        except Exception:
-            buffer.seek(0)
-            return pd.read_excel(buffer, engine="openpyxl")
-
-    except Exception as exc:  # Captura qualquer falha de leitura.
-        st.error(f"Não foi possível ler o arquivo enviado. Detalhes: {exc}")
+            estado = caminho.stat()
+        except OSError:
+            continue
+        arquivos.append((estado.st_mtime, estado.st_size, caminho))
+
+    ocupado = 0
+    for _, tamanho, caminho in sorted(arquivos, reverse=True):
+        ocupado += tamanho
+        if ocupado > TAMANHO_MAXIMO_CACHE:
+            caminho.unlink(missing_ok=True)
+
+
+@st.cache_data(show_spinner=False)
+def _ler_conteudo(buffer: io.BytesIO, extensao: str) -> pd.DataFrame:
+    """Converte o arquivo enviado em um ``DataFrame``.
+
+    O resultado fica em cache, indexado pelo conteúdo do arquivo e pela
+    extensão, para que as reexecuções do Streamlit (zoom, interação com
+    widgets) não precisem interpretar o arquivo novamente. O próprio buffer do
+    upload é lido diretamente, sem cópia dos bytes; cada leitor reposiciona o
+    cursor no início antes de começar.
+
+    Como o cache do Streamlit se perde quando o servidor reinicia, o resultado
+    também é gravado em Parquet no diretório ``.cache``. Um novo envio do mesmo
+    arquivo passa a ser uma leitura colunar rápida. A chave inclui
+    ``VERSAO_CACHE`` e o diretório é limitado a ``TAMANHO_MAXIMO_CACHE``.
+    Falhas nesse cache em disco são ignoradas.
+    """
+
+    # ``getvalue()`` devolve os bytes originais do upload sem cópia, enquanto
+    # ``getbuffer()`` obrigaria o ``BytesIO`` a duplicar todo o conteúdo.
+    resumo = hashlib.blake2b(buffer.getvalue(), digest_size=16)
+    resumo.update(f"{extensao}:{VERSAO_CACHE}".encode())
+    caminho = DIRETORIO_CACHE / f"{resumo.hexdigest()}.parquet"
+
+    try:
+        if caminho.exists():
+            dados = pd.read_parquet(caminho)
+            # Atualiza a data de modificação para que o arquivo conte como
+            # usado recentemente na limpeza do cache.
+            os.utime(caminho)
+            return dados
+    except Exception:
+        pass
+
+    dados = _interpretar_arquivo(buffer, extensao)
+
+    temporario = None
+    try:
+        DIRETORIO_CACHE.mkdir(parents=True, exist_ok=True)
+        # Grava em um arquivo temporário e só então o move para o nome final,
+        # para que outra sessão nunca leia um Parquet pela metade.
+        descritor, temporario = tempfile.mkstemp(
+            dir=DIRETORIO_CACHE, suffix=".tmp"
+        )
+        os.close(descritor)
+        dados.to_parquet(temporario, compression="zstd")
+        os.replace(temporario, caminho)
+        temporario = None
+        _limpar_cache()
+    except Exception:
+        pass
+    finally:
+        if temporario is not None:
+            Path(temporario).unlink(missing_ok=True)
+
+    return dados
+
+
+def _extensao_do_arquivo(arquivo_subido: io.BytesIO) -> str:
+    """Retorna a extensão (em minúsculas) informada pelo widget de upload."""
+
+    nome_arquivo = getattr(arquivo_subido, "name", "")
+    return nome_arquivo.split(".")[-1].lower() if "." in nome_arquivo else ""
+
+
+def carregar_dados(arquivos_subidos: list[io.BytesIO]) -> Optional[pd.DataFrame]:
+    """Lê os arquivos CSV ou XLSX enviados pelo usuário.
+
+    A função tenta identificar automaticamente o formato de cada arquivo com
+    base na extensão informada pelo widget de upload. Os arquivos são lidos em
+    paralelo, validados individualmente e combinados em um único ``DataFrame``
+    contendo apenas as colunas de coordenadas. Caso alguma leitura ou
+    validação falhe, uma mensagem de erro amigável é apresentada e ``None`` é
+    retornado.
+    """
+
+    if not arquivos_subidos:
         return None
 
+    # As threads auxiliares herdam o contexto da execução atual para que o
+    # cache do Streamlit funcione normalmente dentro delas.
+    contexto = get_script_run_ctx()
+    with ThreadPoolExecutor(
+        max_workers=min(8, len(arquivos_subidos)),
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), contexto),
+    ) as executor:
+        futuros = [
+            executor.submit(_ler_conteudo, arquivo, _extensao_do_arquivo(arquivo))
+            for arquivo in arquivos_subidos
+        ]
+
+    quadros = []
+    for arquivo, futuro in zip(arquivos_subidos, futuros):
+        try:
+            dados = futuro.result()
+        except Exception as exc:  # Captura qualquer falha de leitura.
+            nome_arquivo = getattr(arquivo, "name", "enviado")
+            st.error(
+                f"Não foi possível ler o arquivo {nome_arquivo}. Detalhes: {exc}"
+            )
+            return None
+
+        # Normaliza os nomes das colunas uma única vez, para que as etapas
+        # seguintes possam acessá-las diretamente, independentemente de caixa.
+        dados.columns = [str(nome).strip().lower() for nome in dados.columns]
+
+        # Cada arquivo é validado isoladamente: após a concatenação, um arquivo
+        # sem coordenadas apenas sumiria do mapa, sem aviso ao usuário.
+        if not validar_colunas(dados, getattr(arquivo, "name", None)):
+            return None
+
+        quadros.append(dados[["latitude", "longitude"]])
 
-def validar_colunas(dados: pd.DataFrame) -> bool:
-    """Confere se as colunas obrigatórias estão presentes na planilha."""
+    if len(quadros) == 1:
+        return quadros[0]
 
-    colunas_necessarias = {"latitude", "longitude"}
-    colunas_encontradas = set(dados.columns.str.lower())
+    return pd.concat(quadros, ignore_index=True, copy=False)
 
-    if not colunas_necessarias.issubset(colunas_encontradas):
+
+@njit(cache=True)
+def _filtrar_coordenadas(latitudes: np.ndarray, longitudes: np.ndarray):
+    """Remove pares não finitos e calcula o centro em uma única passagem.
+
+    Retorna as latitudes e longitudes válidas e as respectivas médias. Quando
+    nenhum par é válido, as médias são ``NaN``.
+    """
+
+    validas_lat = np.empty_like(latitudes)
+    validas_lon = np.empty_like(longitudes)
+    soma_lat = 0.0
+    soma_lon = 0.0
+    total = 0
+    for i in range(latitudes.size):
+        lat = latitudes[i]
+        lon = longitudes[i]
+        # Descarta ``NaN`` e também infinitos, que quebrariam a média.
+        if np.isfinite(lat) and np.isfinite(lon):
+            validas_lat[total] = lat
+            validas_lon[total] = lon
+            soma_lat += lat
+            soma_lon += lon
+            total += 1
+
+    if total == 0:
+        return validas_lat[:0], validas_lon[:0], np.nan, np.nan
+
+    return (
+        validas_lat[:total],
+        validas_lon[:total],
+        soma_lat / total,
+        soma_lon / total,
+    )
+
+
+def _decimar_coordenadas(
+    latitudes: np.ndarray, longitudes: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """Mantém um único ponto por célula de 0,1° × 0,1°.
+
+    Cada par é reduzido a um identificador inteiro da célula da grade que o
+    contém; o primeiro ponto encontrado em cada célula é preservado, na ordem
+    original dos dados.
+    """
+
+    celulas_lat = np.round(latitudes * 10).astype(np.int64)
+    celulas_lon = np.round(longitudes * 10).astype(np.int64)
+    celulas = (celulas_lat << 16) | (celulas_lon & 0xFFFF)
+    _, indices = np.unique(celulas, return_index=True)
+    indices.sort()
+    return latitudes[indices], longitudes[indices]
+
+
+def validar_colunas(
+    dados: pd.DataFrame, nome_arquivo: Optional[str] = None
+) -> bool:
+    """Confere se as colunas obrigatórias estão presentes na planilha.
+
+    Quando ``nome_arquivo`` é informado, ele aparece na mensagem de erro para
+    identificar qual dos arquivos enviados está incompleto.
+    """
+
+    # ``in`` consulta a tabela de hash do índice de colunas, sem montar um
+    # conjunto com todos os nomes a cada reexecução.
+    if not all(coluna in dados.columns for coluna in COLUNAS_COORDENADAS):
+        arquivo = f"O arquivo {nome_arquivo}" if nome_arquivo else "O arquivo"
         st.error(
-            "O arquivo deve conter as colunas 'latitude' e 'longitude'. "
+            f"{arquivo} deve conter as colunas 'latitude' e 'longitude'. "
             f"Colunas encontradas: {', '.join(dados.columns)}"
         )
         return False
@@ -83,68 +406,178 @@ def validar_colunas(dados: pd.DataFrame) -> bool:
     return True
 
 
-def construir_mapa(dados: pd.DataFrame) -> Map:
-    """Cria e retorna o objeto Folium com os pontos carregados."""
+def _hash_dataframe(dados: pd.DataFrame) -> bytes:
+    """Gera uma chave de cache estável a partir das coordenadas do ``DataFrame``.
+
+    Apenas latitude e longitude, nesta ordem fixa, entram na chave, junto com
+    seus tipos. Assim, arquivos com os mesmos números sob cabeçalhos trocados
+    geram chaves diferentes, e colunas extras não influenciam o cache.
+    """
+
+    coordenadas = dados[["latitude", "longitude"]]
+    tipos = ";".join(str(tipo) for tipo in coordenadas.dtypes).encode()
+    valores = pd.util.hash_pandas_object(coordenadas, index=False).values.tobytes()
+    return tipos + valores
+
+
+def extrair_coordenadas(
+    dados: pd.DataFrame, limite_pontos: Optional[int] = None
+) -> tuple[np.ndarray, np.ndarray, list[float]]:
+    """Retorna latitudes, longitudes válidas e o centro dos pontos.
+
+    Quando ``limite_pontos`` é informado e a quantidade de pontos válidos o
+    ultrapassa, os pontos são reduzidos a um por célula da grade. O centro
+    continua sendo calculado com todos os pontos.
+    """
 
-    # Normaliza nomes das colunas para acessar independentemente de caixa.
-    dados = dados.rename(columns=str.lower)
-    dados["latitude"] = pd.to_numeric(dados["latitude"], errors="coerce")
-    dados["longitude"] = pd.to_numeric(dados["longitude"], errors="coerce")
-    dados = dados.dropna(subset=["latitude", "longitude"])
+    # A conversão tolerante (``to_numeric``) é lenta; só é aplicada quando o
+    # leitor não entregou a coluna já numérica, o caso comum com a dica de
+    # tipos ``float32`` usada na leitura.
+    colunas = []
+    for coluna in ("latitude", "longitude"):
+        valores = dados[coluna]
+        if not pd.api.types.is_numeric_dtype(valores):
+            valores = pd.to_numeric(valores, errors="coerce")
+        colunas.append(
+            valores.to_numpy(dtype=np.float32, copy=False, na_value=np.nan)
+        )
+
+    # Filtra linhas sem coordenadas e calcula o centro (média) de uma só vez.
+    latitudes, longitudes, centro_lat, centro_lon = _filtrar_coordenadas(*colunas)
 
-    if dados.empty:
+    if latitudes.size == 0:
         raise ValueError(
             "Não há registros válidos após remover linhas sem latitude/longitude."
         )
 
-    # Calcula o centro a partir da média das coordenadas.
-    centro = [dados["latitude"].mean(), dados["longitude"].mean()]
+    if limite_pontos is not None and latitudes.size > limite_pontos:
+        latitudes, longitudes = _decimar_coordenadas(latitudes, longitudes)
+
+    return latitudes, longitudes, [centro_lat, centro_lon]
+
+
+def construir_mapa(
+    dados: pd.DataFrame, limite_pontos: Optional[int] = None
+) -> Map:
+    """Cria e retorna o objeto Folium com os pontos carregados."""
+
+    latitudes, longitudes, centro = extrair_coordenadas(dados, limite_pontos)
 
     mapa = Map(location=centro, zoom_start=4, tiles="CartoDB positron")
 
-    marcador_cluster = MarkerCluster(name="Pontos").add_to(mapa)
-    for _, linha in dados.iterrows():
-        Marker(
-            location=[linha["latitude"], linha["longitude"]],
-        ).add_to(marcador_cluster)
+    # O FastMarkerCluster recebe a lista bruta de coordenadas e monta os
+    # marcadores no navegador, evitando um objeto ``Marker`` por ponto no
+    # Python e reduzindo o tamanho do HTML gerado.
+    # Valores ``float32`` viram floats do Python com representação longa
+    # (ex.: -13.55077838897705); arredondar em ``float64`` para 6 casas
+    # (~0,1 m) mantém o HTML enxuto.
+    coordenadas = np.column_stack(
+        (
+            np.round(latitudes.astype(np.float64), 6),
+            np.round(longitudes.astype(np.float64), 6),
+        )
+    ).tolist()
+    FastMarkerCluster(coordenadas, name="Pontos").add_to(mapa)
 
     return mapa
 
 
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _hash_dataframe})
+def renderizar_mapa(
+    dados: pd.DataFrame, limite_pontos: Optional[int] = None
+) -> str:
+    """Retorna o HTML completo do mapa, guardado em cache.
+
+    Serializar o mapa Folium para HTML/JS é caro; como o conjunto de pontos é
+    estático, o HTML pronto é reaproveitado em todas as reexecuções com os
+    mesmos dados e o mesmo limite de pontos.
+    """
+
+    return construir_mapa(dados, limite_pontos).get_root().render()
+
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _hash_dataframe})
+def preparar_pontos(
+    dados: pd.DataFrame, limite_pontos: Optional[int] = None
+) -> pd.DataFrame:
+    """Retorna apenas as coordenadas válidas, prontas para o ``st.map``."""
+
+    latitudes, longitudes, _ = extrair_coordenadas(dados, limite_pontos)
+    return pd.DataFrame({"latitude": latitudes, "longitude": longitudes})
+
+
 def main() -> None:
     """Ponto de entrada do aplicativo."""
 
+    # Configuração inicial da página para um layout amplo.
+    st.set_page_config(page_title="Instapoints", layout="wide")
+
     st.title("Instapoints - Visualizador de Coordenadas")
     st.markdown(
         """
-        Carregue um arquivo **CSV** ou **XLSX** contendo as colunas `latitude` e
-        `longitude`. Após o upload, os pontos serão exibidos em um mapa
-        interativo. Utilize o zoom e clique nos agrupamentos para explorar os
-        dados.
+        Carregue um ou mais arquivos **CSV** ou **XLSX** contendo as colunas
+        `latitude` e `longitude`. Após o upload, os pontos serão exibidos em um
+        mapa interativo. Utilize o zoom e clique nos agrupamentos para explorar
+        os dados.
         """
     )
 
-    arquivo = st.file_uploader(
-        "Selecione um arquivo CSV ou XLSX",
+    arquivos = st.file_uploader(
+        "Selecione um ou mais arquivos CSV ou XLSX",
         type=["csv", "xlsx"],
-        help="O arquivo deve conter as colunas latitude e longitude.",
+        accept_multiple_files=True,
+        help="Os arquivos devem conter as colunas latitude e longitude.",
     )
 
-    dados = carregar_dados(arquivo)
-    if dados is None:
+    if not arquivos:
         st.info("Faça o upload de um arquivo para visualizar o mapa.")
         return
 
-    if not validar_colunas(dados):
+    dados = carregar_dados(arquivos)
+    if dados is None:
         return
 
+    limite_pontos = st.slider(
+        "Limite de pontos exibidos sem redução",
+        min_value=1_000,
+        max_value=LIMITE_PONTOS_MAXIMO,
+        value=LIMITE_PONTOS_PADRAO,
+        step=1_000,
+        help=(
+            "Acima deste limite, o mapa exibe apenas um ponto por célula de "
+            "0,1° de latitude/longitude. Aumente o valor para ver todos os "
+            "pontos, ao custo de um mapa mais lento."
+        ),
+    )
+
     try:
-        mapa = construir_mapa(dados)
+        pontos = preparar_pontos(dados)
     except ValueError as erro:
         st.warning(str(erro))
         return
 
-    st_folium(mapa, width=1000, height=600)
+    # Um limite que não reduz nenhum ponto equivale a não reduzir; usar
+    # ``None`` evita entradas de cache distintas para o mesmo mapa.
+    total_pontos = len(pontos)
+    if limite_pontos >= total_pontos:
+        limite_pontos = None
+
+    # Com muitos pontos, os marcadores do Folium (elementos do DOM) travam o
+    # navegador; nesse caso o ``st.map`` desenha os pontos via WebGL na GPU.
+    # O Folium segue para arquivos menores, em que os agrupamentos ajudam. A
+    # decisão considera apenas os pontos válidos, não as linhas do arquivo.
+    if total_pontos > LIMITE_PONTOS_FOLIUM:
+        if limite_pontos is not None:
+            pontos = preparar_pontos(pontos, limite_pontos)
+        st.caption(
+            "Arquivo com muitos pontos: o mapa é desenhado pela GPU, sem "
+            "agrupamentos."
+        )
+        st.map(pontos)
+    else:
+        components.html(
+            renderizar_mapa(pontos, limite_pontos), width=1000, height=600
+        )
 
 
 if __name__ == "__main__":